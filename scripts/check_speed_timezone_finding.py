@@ -1,7 +1,7 @@
 from typing import Callable, Iterable, List, Tuple
 
 import pytest
-from auxiliaries import get_rnd_query_pt, timefunc
+from auxiliaries import get_rnd_query_pts, timefunc
 
 from timezonefinder import TimezoneFinder, TimezoneFinderL
 
@@ -13,25 +13,19 @@ def get_on_land_pts(length: int):
     # create an array of points where timezone_finder finds something (on_land queries)
     print(f"collecting and storing {N} on land points for the tests...")
     on_land_points = []
-    ps_for_10percent = int(N / 10)
-    percent_done = 0
-
-    i = 0
-    while i < length:
-        lng, lat = get_rnd_query_pt()
-        if tf_instance.timezone_at_land(lng=lng, lat=lat) is not None:
-            i += 1
-            on_land_points.append((lng, lat))
-            if i % ps_for_10percent == 0:
-                percent_done += 10
-                print(percent_done, "%")
+    while len(on_land_points) < length:
+        # NOTE: draw a whole batch of random points at once
+        for lng, lat in get_rnd_query_pts(length):
+            if tf_instance.timezone_at_land(lng=lng, lat=lat) is not None:
+                on_land_points.append((lng, lat))
+        print(f"{min(len(on_land_points) / length, 1.0):.0%}")
 
     print("Done.\n")
-    return on_land_points
+    return on_land_points[:length]
 
 
 def get_random_points(length: int) -> List[Tuple[float, float]]:
-    return [get_rnd_query_pt() for _ in range(length)]
+    return get_rnd_query_pts(length)
 
 
 test_points_land = get_on_land_pts(N)
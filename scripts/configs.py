@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Set
+from typing import Optional, Set
 
 SCRIPT_FOLDER = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_FOLDER.parent
@@ -9,8 +9,19 @@ DEFAULT_OUTPUT_PATH = PROJECT_ROOT / "timezonefinder"  # overwrite the old data
 DEBUG = False
 # DEBUG = True
 DEBUG_ZONE_CTR_STOP = 5  # parse only some polygons in debugging mode
+# store the parsed input data next to the input file and reuse it in later runs (instead of parsing the JSON again)
+USE_PARSE_CACHE = False
+PARSE_CACHE_SUFFIX = ".parsed.pickle"
+# NOTE: increase whenever the cached data changes, in order to invalidate existing cache files
+PARSE_CACHE_VERSION = 1
+# amount of processes computing the shortcuts in parallel. None: one per CPU core, 1: no parallel processing
+NR_OF_WORKERS: Optional[int] = None
+# amount of (adjacent) hex cells sent to a worker process at once
+WORKER_CHUNK_SIZE = 512
 MAX_LAT = 90.0
 MAX_LNG = 180.0
+# height of the latitude bands used for indexing the polygons (in degree)
+LAT_BAND_HEIGHT = 1.0
 HexIdSet = Set[int]
 PolyIdSet = Set[int]
 ZoneIdSet = Set[int]
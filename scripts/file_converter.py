@@ -60,11 +60,22 @@ in res=3 it takes only slightly more space to store just the highest resolution
     -> only use one resolution, because of the higher simplicity of the lookup algorithms
 """
 
-import functools
 import itertools
-from dataclasses import dataclass
+import multiprocessing
+from array import array
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import h3.api.numpy_int as h3
 import numpy as np
@@ -74,29 +85,45 @@ from scripts.configs import (
     DEBUG_ZONE_CTR_STOP,
     DEFAULT_INPUT_PATH,
     DEFAULT_OUTPUT_PATH,
+    LAT_BAND_HEIGHT,
     MAX_LAT,
     MAX_LNG,
+    NR_OF_WORKERS,
+    PARSE_CACHE_SUFFIX,
+    PARSE_CACHE_VERSION,
+    USE_PARSE_CACHE,
+    WORKER_CHUNK_SIZE,
     HexIdSet,
-    PolyIdSet,
     ZoneIdSet,
 )
 from scripts.utils import (
+    iter_json_features,
+    load_pickle,
     print_shortcut_statistics,
+    shortcut_entry_counts,
     time_execution,
-    to_numpy_polygon,
+    to_numpy_polygons,
     write_binary,
     write_boundary_data,
     write_coordinate_data,
     write_json,
-    load_json,
+    write_pickle,
+)
+from scripts.utils_numba import (
+    corrected_hex_boundaries,
+    hex_pts_in_polys,
 )
+
 from timezonefinder.configs import (
+    COORD2INT_FACTOR,
     DTYPE_FORMAT_H,
     DTYPE_FORMAT_I,
+    DTYPE_FORMAT_SIGNED_I_NUMPY,
     HOLE_ADR2DATA,
     HOLE_COORD_AMOUNT,
     HOLE_DATA,
     HOLE_REGISTRY_FILE,
+    INT2COORD_FACTOR,
     NR_BYTES_I,
     POLY_ADR2DATA,
     POLY_COORD_AMOUNT,
@@ -110,88 +137,111 @@ from timezonefinder.configs import (
     THRES_DTYPE_I,
     TIMEZONE_NAMES_FILE,
 )
-from timezonefinder.hex_helpers import export_shortcuts_binary, lies_in_h3_cell
+from timezonefinder.hex_helpers import write_shortcut_entries
 from timezonefinder.utils import (
     any_pt_in_poly,
     coord2int,
     fully_contained_in_hole,
-    int2coord,
 )
 
-ShortcutMapping = Dict[int, List[int]]
+MAX_LAT_INT = coord2int(MAX_LAT)
+MAX_LNG_INT = coord2int(MAX_LNG)
+LAT_BAND_HEIGHT_INT = coord2int(LAT_BAND_HEIGHT)
+NR_OF_LAT_BANDS = int(np.ceil(2 * MAX_LAT / LAT_BAND_HEIGHT))
+# the single cell surrounding each pole, for every h3 resolution (0-15)
+N_POLE_CELLS = tuple(h3.latlng_to_cell(MAX_LAT, 0.0, res) for res in range(16))
+S_POLE_CELLS = tuple(h3.latlng_to_cell(-MAX_LAT, 0.0, res) for res in range(16))
 
 nr_of_polygons = -1
 nr_of_zones = -1
 all_tz_names = []
 poly_zone_ids = []
-poly_boundaries = []
+# the polygon boundaries as one contiguous array per value (xmax, xmin, ymax, ymin)
+poly_bounds_arr = np.zeros((4, 0), dtype=np.int64)
+# index: the ids of all polygons overlapping each latitude band (from south to north)
+poly_ids_of_band: List[np.ndarray] = []
 polygons: List[np.ndarray] = []
+# the coordinates of all polygons concatenated and the index where each polygon starts (plus the total length)
+poly_coords_flat = np.zeros((2, 0), dtype=DTYPE_FORMAT_SIGNED_I_NUMPY)
+poly_offsets = np.zeros(1, dtype=np.int64)
 polygon_lengths = []
 nr_of_holes = 0
 polynrs_of_holes = []
-holes = []
+holes: List[np.ndarray] = []
+# the coordinates of all holes concatenated and the index where each hole starts (plus the total length)
+hole_coords_flat = np.zeros((2, 0), dtype=DTYPE_FORMAT_SIGNED_I_NUMPY)
+hole_offsets = np.zeros(1, dtype=np.int64)
+# the id of the first hole of every polygon (plus one more entry for knowing where the holes of the last polygon end)
+# NOTE: the holes are sorted by polygon id -> the holes of every polygon are a contiguous range
+first_hole_of_poly = np.zeros(1, dtype=np.int64)
+# the hole boundaries (same layout as the polygon boundaries)
+hole_bounds_arr = np.zeros((4, 0), dtype=np.int64)
 all_hole_lengths = []
 list_of_pointers = []
 poly_nr2zone_id = []
 
 
-def _holes_in_poly(poly_nr):
-    for i, nr in enumerate(polynrs_of_holes):
-        if nr == poly_nr:
-            yield holes[i]
+def _ring_views(coords_flat: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """returns: the coordinates of every ring as a view into the concatenated coordinates (no copies)"""
+    return [
+        coords_flat[:, start:end]
+        for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    ]
 
 
 def parse_polygons_from_json(input_path: Path) -> int:
     global nr_of_holes, nr_of_polygons, nr_of_zones, poly_zone_ids
-    global polygons, polygon_lengths, poly_zone_ids, poly_boundaries
+    global polygons, polygon_lengths, poly_zone_ids, poly_bounds_arr
+    global poly_ids_of_band, poly_coords_flat, poly_offsets
+    global holes, hole_coords_flat, hole_offsets, polynrs_of_holes, first_hole_of_poly
+    global hole_bounds_arr
 
     print(f"parsing input file: {input_path}\n...\n")
-    input_json = load_json(input_path)
-    tz_list = input_json["features"]
-
+    # NOTE: the features might be streamed one at a time
+    tz_list = iter_json_features(input_path)
+
+    # NOTE: copy the coordinates of all rings into flat buffers right away
+    # instead of converting every single ring into a separate array
+    # -> the (Python float) coordinates of every feature can be freed right after it has been processed
+    poly_coord_buffer = array("d")
+    hole_coord_buffer = array("d")
+    # NOTE: typed arrays store the values unboxed (8 bytes each) and can be converted without a copy
+    polygon_lengths = array("q")
+    poly_zone_ids = array("q")
+    polynrs_of_holes = array("q")
+    hole_lengths = array("q")
     poly_id = 0
     zone_id = 0
-    print("parsing data...\nprocessing holes:")
+    # NOTE: no progress output per hole (a flushed terminal write for every hole), the totals are reported below
+    print("parsing data...")
     for zone_id, tz_dict in enumerate(tz_list):
         tz_name = tz_dict.get("properties").get("tzid")
         all_tz_names.append(tz_name)
-        geometry = tz_dict.get("geometry")
-        if geometry.get("type") == "MultiPolygon":
+        geometry = tz_dict["geometry"]
+        coordinates = geometry["coordinates"]
+        if geometry["type"] == "MultiPolygon":
             # depth is 4
-            multipolygon = geometry.get("coordinates")
+            multipolygon = coordinates
         else:
             # depth is 3 (only one polygon, possibly with holes!)
-            multipolygon = [geometry.get("coordinates")]
+            multipolygon = (coordinates,)
         # multipolygon has depth 4
         # assert depth_of_array(multipolygon) == 4
         for poly_with_hole in multipolygon:
+            # NOTE: iterate instead of popping the first entry (shifting all remaining entries of the list)
+            rings = iter(poly_with_hole)
             # the first entry is the outer polygon
-            # NOTE: starting from here, only coordinates converted into int32 will be considered!
-            # this allows using the JIT util function already here
-            poly = to_numpy_polygon(poly_with_hole.pop(0))
-            polygons.append(poly)
-            x_coords = poly[0]
-            y_coords = poly[1]
-            polygon_lengths.append(len(x_coords))
-            bounds = Boundaries(
-                np.max(x_coords), np.min(x_coords), np.max(y_coords), np.min(y_coords)
-            )
-            poly_boundaries.append(bounds)
+            poly = next(rings)
+            poly_coord_buffer.extend(itertools.chain.from_iterable(poly))
+            polygon_lengths.append(len(poly))
             poly_zone_ids.append(zone_id)
 
             # everything else is interpreted as a hole!
-            for hole_nr, hole in enumerate(poly_with_hole):
+            for hole in rings:
                 nr_of_holes += 1  # keep track of how many holes there are
-                print(
-                    f"\rpolygon {poly_id}, zone {tz_name}, hole number {nr_of_holes}, {hole_nr + 1} in polygon",
-                    end="",
-                )
                 polynrs_of_holes.append(poly_id)
-                hole_poly = to_numpy_polygon(hole)
-                holes.append(hole_poly)
-                nr_coords = hole_poly.shape[1]
-                assert nr_coords >= 3
-                all_hole_lengths.append(nr_coords)
+                hole_coord_buffer.extend(itertools.chain.from_iterable(hole))
+                hole_lengths.append(len(hole))
 
             poly_id += 1
 
@@ -199,6 +249,37 @@ def parse_polygons_from_json(input_path: Path) -> int:
             break
 
     print("\n")
+    # NOTE: the parsed JSON holds all coordinates as Python floats -> free the memory before the conversion
+    del tz_list
+    # NOTE: starting from here, only coordinates converted into int32 will be considered!
+    # this allows using the JIT util functions
+    # NOTE: a single buffer allows checking multiple polygons at once with JIT compiled functions
+    # numpy arrays allow gathering the values of many polygons at once
+    poly_coords_flat, polygon_lengths, poly_bounds_arr = to_numpy_polygons(
+        poly_coord_buffer, polygon_lengths
+    )
+    del poly_coord_buffer
+    poly_zone_ids = np.frombuffer(poly_zone_ids, dtype=np.int64)
+    poly_offsets = np.zeros(len(polygon_lengths) + 1, dtype=np.int64)
+    np.cumsum(polygon_lengths, out=poly_offsets[1:])
+    polygons = _ring_views(poly_coords_flat, poly_offsets)
+    # the cached cells of the points refer to the previous polygons
+    _vertex_cell_cache.clear()
+    hole_coords_flat, hole_lengths, hole_bounds_arr = to_numpy_polygons(
+        hole_coord_buffer, hole_lengths
+    )
+    del hole_coord_buffer
+    all_hole_lengths.extend(hole_lengths.tolist())
+    hole_offsets = np.zeros(len(hole_lengths) + 1, dtype=np.int64)
+    np.cumsum(hole_lengths, out=hole_offsets[1:])
+    holes = _ring_views(hole_coords_flat, hole_offsets)
+    polynrs_of_holes = np.frombuffer(polynrs_of_holes, dtype=np.int64)
+    first_hole_of_poly = np.searchsorted(
+        polynrs_of_holes, np.arange(len(polygon_lengths) + 1)
+    )
+    # NOTE: (4, N) layout (xmax, xmin, ymax, ymin) allows comparing the boundaries of many polygons at once
+    # the boundaries of all polygons and holes have been computed together with the coordinate conversion
+    poly_ids_of_band = index_lat_bands(poly_bounds_arr)
     nr_of_polygons = len(polygon_lengths)
     nr_of_zones = len(all_tz_names)
     assert nr_of_polygons >= 0
@@ -208,9 +289,7 @@ def parse_polygons_from_json(input_path: Path) -> int:
         f"polygon counter {poly_id} and entry amount in all_length {nr_of_polygons} are different."
     )
 
-    if 0 in polygon_lengths:
-        raise ValueError()
-
+    # NOTE: empty polygons are not possible at this point (every ring has been checked to have at least 3 points)
     # binary file value range tests:
     assert nr_of_polygons < THRES_DTYPE_H, (
         f"address overflow: #{nr_of_polygons} polygon ids cannot be encoded as {DTYPE_FORMAT_H}!"
@@ -218,11 +297,12 @@ def parse_polygons_from_json(input_path: Path) -> int:
     assert nr_of_zones < THRES_DTYPE_H, (
         f"address overflow: #{nr_of_zones} zone ids cannot be encoded as {DTYPE_FORMAT_H}!"
     )
-    max_poly_length = max(polygon_lengths)
+    # NOTE: numpy reductions instead of iterating over all values in Python
+    max_poly_length = int(polygon_lengths.max())
     assert max_poly_length < THRES_DTYPE_I, (
         f"address overflow: the maximal amount of coords {max_poly_length} cannot be represented by {DTYPE_FORMAT_I}"
     )
-    max_hole_poly_length = max(all_hole_lengths)
+    max_hole_poly_length = int(hole_lengths.max())
     assert max_hole_poly_length < THRES_DTYPE_H, (
         f"address overflow: the maximal amount of coords in hole polygons "
         f"{max_hole_poly_length} cannot be represented by {DTYPE_FORMAT_I}"
@@ -235,17 +315,71 @@ def parse_polygons_from_json(input_path: Path) -> int:
     print(f"{max_poly_length:,} maximal amount of coordinates in one polygon")
     print(f"{max_hole_poly_length:,} maximal amount of coordinates in a hole polygon")
     # there are two floats per coordinate (lng, lat)
-    nr_of_floats = 2 * sum(polygon_lengths)
+    nr_of_floats = 2 * int(polygon_lengths.sum())
     print(f"{nr_of_floats:,} floats in all the polygons (2 per point)")
     polygon_space = nr_of_floats * NR_BYTES_I
     return polygon_space
 
 
+def _parsed_state() -> Dict[str, object]:
+    """all the data parsed from the input file (before updating the zone names)
+
+    NOTE: the polygon index depends on the configuration (not only on the input file) and is being rebuilt instead
+    """
+    state = _worker_state()
+    del state["poly_ids_of_band"]
+    state.update(
+        all_tz_names=all_tz_names,
+        nr_of_holes=nr_of_holes,
+        polynrs_of_holes=polynrs_of_holes,
+        all_hole_lengths=all_hole_lengths,
+    )
+    return state
+
+
+def load_polygons(input_path: Path, use_cache: bool = USE_PARSE_CACHE) -> int:
+    """parses the input file or loads the data parsed in a previous run from the cache file next to it
+
+    NOTE: parsing the large JSON input takes considerable time in repeated runs (e.g. while developing)
+    the cache is only valid for the exact same input file (path, modification time, size),
+    mode and cache format
+    """
+    if not use_cache:
+        return parse_polygons_from_json(input_path)
+
+    global polygons, holes, poly_ids_of_band
+    cache_path = input_path.with_name(input_path.name + PARSE_CACHE_SUFFIX)
+    stats = input_path.stat()
+    cache_key = (
+        PARSE_CACHE_VERSION,
+        str(input_path.resolve()),
+        stats.st_mtime_ns,
+        stats.st_size,
+        DEBUG,
+        DEBUG_ZONE_CTR_STOP,
+    )
+    if cache_path.exists():
+        cache = load_pickle(cache_path)
+        if cache["key"] == cache_key:
+            globals().update(cache["state"])
+            polygons = _ring_views(poly_coords_flat, poly_offsets)
+            holes = _ring_views(hole_coords_flat, hole_offsets)
+            poly_ids_of_band = index_lat_bands(poly_bounds_arr)
+            _vertex_cell_cache.clear()
+            print(f"reusing the data parsed from {input_path}")
+            # there are two floats per coordinate (lng, lat)
+            return 2 * int(polygon_lengths.sum()) * NR_BYTES_I
+        print("the cached data is outdated")
+
+    polygon_space = parse_polygons_from_json(input_path)
+    write_pickle({"key": cache_key, "state": _parsed_state()}, cache_path)
+    return polygon_space
+
+
 def update_zone_names(output_path: Path):
     # update all the zone names and set the right ids to be written in the poly_zone_ids.bin
     global poly_zone_ids
     global list_of_pointers
-    global poly_boundaries
     global polygons
     global polygon_lengths
     global polynrs_of_holes
@@ -256,91 +390,97 @@ def update_zone_names(output_path: Path):
     # pickle the zone names (python array)
     write_json(all_tz_names, file_path)
     print("...Done.\n\nComputing where zones start and end...")
-    last_id = -1
-    zone_id = 0
-    poly_nr = 0
-    for poly_nr, zone_id in enumerate(poly_zone_ids):
-        if zone_id != last_id:
-            poly_nr2zone_id.append(poly_nr)
-            assert zone_id >= last_id
-            last_id = zone_id
     assert nr_of_polygons == len(poly_zone_ids)
-
-    # TODO
-    # assert (
-    #         zone_id == nr_of_zones - 1
-    # ), f"not pointing to the last zone with id {nr_of_zones - 1}"
-    # assert (
-    #         poly_nr == nr_of_polygons - 1
-    # ), f"not pointing to the last polygon with id {nr_of_polygons - 1}"
+    zone_id_steps = np.diff(poly_zone_ids)
+    assert np.all(zone_id_steps >= 0), "the polygons are not sorted by zone id"
+    # a new zone starts at the first polygon and wherever the zone id changes
+    zone_starts = np.flatnonzero(zone_id_steps) + 1
+    # NOTE: the entries of a previous run must not be kept
+    poly_nr2zone_id.clear()
+    poly_nr2zone_id.append(0)
+    poly_nr2zone_id.extend(zone_starts.tolist())
     # ATTENTION: add one more entry for knowing where the last zone ends!
     # ATTENTION: the last entry is one higher than the last polygon id (to be consistant with the
     poly_nr2zone_id.append(nr_of_polygons)
-    # assert len(poly_nr2zone_id) == nr_of_zones + 1
+    assert len(poly_nr2zone_id) == nr_of_zones + 1, (
+        f"the polygons of {len(poly_nr2zone_id) - 1} zones have been found, expected {nr_of_zones}"
+    )
     print("...Done.\n")
 
 
-def any_pt_in_cell(h: int, poly_nr: int) -> bool:
-    def pt_in_cell(pt: np.ndarray) -> bool:
-        # ATTENTION: must first convert integers back to coord floats!
-        lng = int2coord(pt[0])
-        lat = int2coord(pt[1])
-        return lies_in_h3_cell(h, lng, lat)
-
-    poly = polygons[poly_nr]
-    return any(map(pt_in_cell, poly.T))
-
-
-def get_corrected_hex_boundaries(
-    x_coords, y_coords, surr_n_pole, surr_s_pole
-) -> Tuple["Boundaries", bool]:
-    """boundaries of a hex cell used for pre-filtering the polygons
-        which have to be checked with expensive point-in-polygon algorithm
-
-    ATTENTION: a h3 polygon may cross the boundaries of the lat/lng coordinate plane (only in lng=x direction)
-    -> cannot use usual geometry assumptions (polygon algorithm, min max boundary check etc.)
-    -> rectify boundaries
-
-    ATTENTION: only using coordinates converted to integers!
-    NOTE: convert to regular int type to prevent overflow
-
-    Observation: except for cells close to the poles,
-        h3 hexagons can usually only span a fraction of the globe (<< 360 degree lng)
-    high longitude difference observed without surrounding a pole
-    -> indicates crossing the +-180 deg lng boundary
-    ATTENTION: min and max of the coordinates would only  pick the points closest to the +-180 deg lng boundary,
-      but not the points furthest apart!
-    getting this "pre-filtering" based on boundaries right across the +-180 deg lng boundary is tricky
-        -> do not exclude any longitudes for simplicity and correctness
-    this is only relevant for a fraction of hex cells plus filtering will still happen based on the latitude!
+def any_pt_in_cell(cell: "Hex", poly_nr: int) -> bool:
+    x_coords, y_coords = polygons[poly_nr]
+    # NOTE: only polygon points close to the cell can lie within it
+    # -> cheap integer test to rule out most points before the expensive h3 lookups
+    # ATTENTION: the edges of h3 cells are arcs, a cell can protrude the boundaries of its vertices
+    # -> use a generous margin
+    bounds = cell.bounds
+    margin = (bounds.xmax - bounds.xmin + bounds.ymax - bounds.ymin) // 2
+    close = (
+        (x_coords >= max(bounds.xmin - margin, -MAX_LNG_INT))
+        & (x_coords <= min(bounds.xmax + margin, MAX_LNG_INT))
+        & (y_coords >= max(bounds.ymin - margin, -MAX_LAT_INT))
+        & (y_coords <= min(bounds.ymax + margin, MAX_LAT_INT))
+    )
+    if not close.any():
+        return False
+    return bool(np.any(vertex_cells(poly_nr, cell.res, close) == cell.id))
+
+
+# the h3 cells (per resolution) of all polygon points in the order of poly_coords_flat (0: not computed yet)
+_vertex_cell_cache: Dict[int, np.ndarray] = {}
+
+
+def vertex_cells(poly_nr: int, res: int, selection: np.ndarray) -> np.ndarray:
+    """returns: the h3 cells of the selected points of a polygon
+
+    NOTE: neighbouring cells check the same polygon points repeatedly
+    -> every point is only being converted once (per resolution), the results are being cached
     """
-    xmax0, xmin0, ymax0, ymin0 = (
-        int(max(x_coords)),
-        int(min(x_coords)),
-        int(max(y_coords)),
-        int(min(y_coords)),
+    cells_flat = _vertex_cell_cache.get(res)
+    if cells_flat is None:
+        cells_flat = np.zeros(poly_coords_flat.shape[1], dtype=np.uint64)
+        _vertex_cell_cache[res] = cells_flat
+    cells = cells_flat[poly_offsets[poly_nr] : poly_offsets[poly_nr + 1]]
+    idxs = np.flatnonzero(selection)
+    missing = idxs[cells[idxs] == 0]
+    if len(missing) > 0:
+        x_coords, y_coords = polygons[poly_nr]
+        # ATTENTION: must first convert integers back to coord floats!
+        lngs = (x_coords[missing] * INT2COORD_FACTOR).tolist()
+        lats = (y_coords[missing] * INT2COORD_FACTOR).tolist()
+        # NOTE: h3 offers no vectorised variant, but mapping avoids Python level loop overhead
+        cell_ids = map(h3.latlng_to_cell, lats, lngs, itertools.repeat(res))
+        cells[missing] = np.fromiter(cell_ids, dtype=np.uint64, count=len(missing))
+    return cells[idxs]
+
+
+def lat_bands(y_coords: np.ndarray) -> np.ndarray:
+    """returns: the index of the latitude band each (integer) latitude falls into"""
+    return np.clip(
+        (y_coords + MAX_LAT_INT) // LAT_BAND_HEIGHT_INT, 0, NR_OF_LAT_BANDS - 1
     )
-    max_latitude = coord2int(MAX_LAT)
-    max_longitude = coord2int(MAX_LNG)
 
-    delta_y = abs(ymax0 - ymin0)
-    assert delta_y < max_latitude, f"longitude difference {int2coord(delta_y)} too high"
-    delta_x = abs(xmax0 - xmin0)
-    x_overflow = delta_x > max_longitude
 
-    if surr_n_pole:
-        # clip to max lat
-        ymax0 = max_latitude
-    elif surr_s_pole:
-        # clip to min lat
-        ymin0 = -max_latitude
+def index_lat_bands(poly_bounds: np.ndarray) -> List[np.ndarray]:
+    """returns: the ids of all polygons overlapping each latitude band"""
+    poly_band_min = lat_bands(poly_bounds[3])
+    poly_band_max = lat_bands(poly_bounds[2])
+    return [
+        np.flatnonzero((poly_band_min <= band) & (poly_band_max >= band))
+        for band in range(NR_OF_LAT_BANDS)
+    ]
+
 
-    if surr_n_pole or surr_s_pole or x_overflow:
-        # search all lngs for cells close to the poles or crossing the +-180 deg lng boundary
-        xmin0 = -max_longitude
-        xmax0 = max_longitude
+def query_poly_index(bounds: "Boundaries") -> np.ndarray:
+    """returns the ids of all polygons whose boundaries might overlap with the given boundaries
 
-    return Boundaries(xmax0, xmin0, ymax0, ymin0), x_overflow
+    NOTE: only the polygons within the latitude bands covered by the boundaries are being considered.
+    the remaining candidates still have to be checked against the full boundaries
+    """
+    band_min, band_max = lat_bands(np.array((bounds.ymin, bounds.ymax)))
+    # NOTE: ascending polygon ids, independent of the index order
+    return np.unique(np.concatenate(poly_ids_of_band[band_min : band_max + 1]))
 
 
 class Boundaries(NamedTuple):
@@ -349,46 +489,47 @@ class Boundaries(NamedTuple):
     ymax: float
     ymin: float
 
-    def overlaps(self, other: "Boundaries") -> bool:
-        if not isinstance(other, Boundaries):
-            raise TypeError
-        if self.xmin > other.xmax:
-            return False
-        if self.xmax < other.xmin:
-            return False
-        if self.ymin > other.ymax:
-            return False
-        if self.ymax < other.ymin:
-            return False
-        return True
-
-
-@dataclass
+
 class Hex:
-    id: int
-    res: int
-    coords: np.ndarray
-    bounds: Boundaries
-    x_overflow: bool
-    surr_n_pole: bool
-    surr_s_pole: bool
-    _poly_candidates: Optional[PolyIdSet] = None
-    _polys_in_cell: Optional[PolyIdSet] = None
-    _zones_in_cell: Optional[ZoneIdSet] = None
-
-    @classmethod
-    def from_id(cls, id: int):
-        res = h3.get_resolution(id)
-        coord_pairs = h3.cell_to_boundary(id)
-        # ATTENTION: (lat, lng)! pairs
-        coords = to_numpy_polygon(coord_pairs, flipped=True)
-        x_coords, y_coords = coords[0], coords[1]
-        surr_n_pole = lies_in_h3_cell(id, lng=0.0, lat=MAX_LAT)
-        surr_s_pole = lies_in_h3_cell(id, lng=0.0, lat=-MAX_LAT)
-        bounds, x_overflow = get_corrected_hex_boundaries(
-            x_coords, y_coords, surr_n_pole, surr_s_pole
-        )
-        return cls(id, res, coords, bounds, x_overflow, surr_n_pole, surr_s_pole)
+    # NOTE: no instance __dict__ -> smaller memory footprint when storing many cells
+    # ATTENTION: dataclass(slots=True) requires Python 3.10+
+    __slots__ = (
+        "_poly_candidates",
+        "_polys_in_cell",
+        "_zones_in_cell",
+        "bounds",
+        "coords",
+        "id",
+        "res",
+        "surr_n_pole",
+        "surr_s_pole",
+        "x_overflow",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        res: int,
+        coords: np.ndarray,
+        bounds: Boundaries,
+        x_overflow: bool,
+        surr_n_pole: bool,
+        surr_s_pole: bool,
+    ):
+        self.id = id
+        self.res = res
+        self.coords = coords
+        self.bounds = bounds
+        self.x_overflow = x_overflow
+        self.surr_n_pole = surr_n_pole
+        self.surr_s_pole = surr_s_pole
+        # NOTE: lazily computed (and cached) results, not part of the constructor
+        self._poly_candidates: Optional[np.ndarray] = None
+        self._polys_in_cell: Optional[Tuple[int, ...]] = None
+        self._zones_in_cell: Optional[ZoneIdSet] = None
+
+    def __repr__(self) -> str:
+        return f"Hex(id={self.id}, res={self.res}, bounds={self.bounds})"
 
     @property
     def is_special(self) -> bool:
@@ -396,58 +537,68 @@ class Hex:
 
     def _init_candidates(self):
         """
-        here one might be tempted to only consider the actual detected zones of the parent cell
-        to narrow down choice and speed up the computation up.
-        however, the child hexagon cells protrude from the parent (cf. https://h3geo.org/docs/highlights/indexing)
-            and hence the candidate zones are different
-        solution: take the "true" parents not just the single parent
-        note: do not just take the true included polygons,
-            but only the candidates to avoid expensive point-in-polygon computations
-
-        Note: also the root level hexagon cells are too large to easily check for polygon in hex inclusion
-        (might overlap without included vertices but just intersecting edges!).
-        Taking just the smaller set of candidates is still valid (no point in polygon check)
+        NOTE: query the polygon index directly
+        instead of computing the candidates of all ("true") parent cells of the lower resolutions
         """
         if self._poly_candidates is not None:
             # avoid overwriting initialised values
             return
-        # self._poly_candidates = set(range(nr_of_polygons))
-        # return
-        # TODO test once again
-        if self.res == 0:
-            # at the highest level all polygons should be tested
-            self._poly_candidates = set(range(nr_of_polygons))
-            return
-
-        candidates: HexIdSet = set()
-        for parent_id in self.true_parents:
-            parent_hex = get_hex(parent_id)
-            parent_polys = parent_hex.poly_candidates
-            candidates.update(parent_polys)
-
-        self._poly_candidates = candidates
-
-    def is_poly_candidate(self, poly_id: int) -> bool:
-        cell_bounds = self.bounds
-        poly_bounds = poly_boundaries[poly_id]
-        overlapping = cell_bounds.overlaps(poly_bounds)
-        return overlapping
+        self._poly_candidates = query_poly_index(self.bounds)
 
     @property
-    def poly_candidates(self) -> Set[int]:
+    def poly_candidates(self) -> np.ndarray:
+        """the ids of all polygons whose boundaries overlap with the boundaries of the cell"""
         self._init_candidates()
-        real_candidates = set(filter(self.is_poly_candidate, self._poly_candidates))
-        self._poly_candidates = real_candidates
+        # NOTE: check the boundaries of all candidates at once instead of one polygon at a time
+        candidates = self._poly_candidates
+        xmax, xmin, ymax, ymin = poly_bounds_arr[:, candidates]
+        cell_bounds = self.bounds
+        overlapping = (
+            (xmin <= cell_bounds.xmax)
+            & (xmax >= cell_bounds.xmin)
+            & (ymin <= cell_bounds.ymax)
+            & (ymax >= cell_bounds.ymin)
+        )
+        self._poly_candidates = candidates[overlapping]
         return self._poly_candidates
 
-    def lies_in_cell(self, poly_nr: int) -> bool:
+    def holes_possibly_containing(self, poly_nr: int) -> List[np.ndarray]:
+        """returns: the holes of the given polygon which could contain the whole cell
+
+        NOTE: a cell can only lie within a hole if all its points lie within the boundaries of the hole
+        """
+        first_hole = first_hole_of_poly[poly_nr]
+        last_hole = first_hole_of_poly[poly_nr + 1]
+        if first_hole == last_hole:
+            return []
+        xmax, ymax = self.coords.max(axis=1)
+        xmin, ymin = self.coords.min(axis=1)
+        hole_xmax, hole_xmin, hole_ymax, hole_ymin = hole_bounds_arr[
+            :, first_hole:last_hole
+        ]
+        enclosing = (
+            (hole_xmax >= xmax)
+            & (hole_xmin <= xmin)
+            & (hole_ymax >= ymax)
+            & (hole_ymin <= ymin)
+        )
+        return [
+            holes[hole_nr]
+            for hole_nr in (np.flatnonzero(enclosing) + first_hole).tolist()
+        ]
+
+    def lies_in_cell(self, poly_nr: int, overlap: Optional[bool] = None) -> bool:
+        """
+        :param overlap: whether any point of the hex cell lies within the polygon, if known already
+        """
         hex_coords = self.coords
-        poly_coords = polygons[poly_nr]
-        overlap = any_pt_in_poly(hex_coords, poly_coords)
+        if overlap is None:
+            poly_coords = polygons[poly_nr]
+            overlap = any_pt_in_poly(hex_coords, poly_coords)
         if not overlap:
             # also test the inverse: if any point of the polygon lies inside the hex cell
             # ATTENTION: some hex cells cannot be used as polygons in regular point in polygon algorithm!
-            overlap = any_pt_in_cell(self.id, poly_nr)
+            overlap = any_pt_in_cell(self, poly_nr)
 
         # ATTENTION: in general polygons can overlap without having included vertices
         # usually the polygon edges would need to be checked for intersections
@@ -458,26 +609,36 @@ class Hex:
         # account for holes in polygon
         # only check if found overlapping
         if overlap:
-            for hole in _holes_in_poly(poly_nr):
+            for hole in self.holes_possibly_containing(poly_nr):
                 # check all hex point within hole
                 if fully_contained_in_hole(hex_coords, hole):
                     return False
         return overlap
 
     @property
-    def polys_in_cell(self) -> Set[int]:
+    def polys_in_cell(self) -> Tuple[int, ...]:
         if self._polys_in_cell is None:
             # lazy evaluation, caching
-            self._polys_in_cell = set(filter(self.lies_in_cell, self.poly_candidates))
+            # NOTE: an immutable sequence can directly be used as shortcut entry without copying
+            candidate_arr = self.poly_candidates
+            # NOTE: check the points of the cell against all polygon candidates at once
+            overlaps = hex_pts_in_polys(
+                self.coords, poly_coords_flat, poly_offsets, candidate_arr
+            )
+            self._polys_in_cell = tuple(
+                poly_nr
+                for poly_nr, overlap in zip(candidate_arr.tolist(), overlaps.tolist())
+                if self.lies_in_cell(poly_nr, overlap)
+            )
         return self._polys_in_cell
 
     @property
     def zones_in_cell(self) -> Set[int]:
         if self._zones_in_cell is None:
             # lazy evaluation, caching
-            self._zones_in_cell = set(
-                map(lambda p: poly_zone_ids[p], self.polys_in_cell)
-            )
+            # NOTE: gather the zones of all polygons at once
+            poly_ids = np.asarray(self.polys_in_cell, dtype=np.int64)
+            self._zones_in_cell = set(poly_zone_ids[poly_ids].tolist())
         return self._zones_in_cell
 
     @property
@@ -495,31 +656,65 @@ class Hex:
     def neighbours(self) -> HexIdSet:
         return set(h3.grid_ring(self.id, k=1))
 
-    @property
-    def true_parents(self) -> HexIdSet:
-        """
-        hexagons do not cleanly subdivide into seven finer hexagons.
-        the child hexagon cells protrude from the parent (cf. https://h3geo.org/docs/highlights/indexing)
-            and hence a cell does not have a single, but actually up to 2 "true" parents
 
-        returns: the hex ids of all parent cells which any of the cell points belong
-        """
-        if self.res == 0:
-            raise ValueError("not defined for resolution 0")
-        lower_res = self.res - 1
-        # NOTE: (lat,lng) pairs!
-        coord_pairs = h3.cell_to_boundary(self.id)
-        return {h3.latlng_to_cell(pt[0], pt[1], lower_res) for pt in coord_pairs}
+def build_hexes_bulk(hex_ids: Sequence[int]) -> List[Hex]:
+    """constructs the hex cells of a single resolution at once
+
+    NOTE: instead of converting and reducing the boundary coordinates of every cell separately,
+    the coordinates of all cells are being stored in a single array and processed with vectorised NumPy operations.
+    """
+    nr_of_hexes = len(hex_ids)
+    if nr_of_hexes == 0:
+        return []
+    res = h3.get_resolution(hex_ids[0])
+    # ATTENTION: the cells have a varying amount of vertices (pentagons, distortion vertices)
+    # -> concatenate all cell boundaries and use the offsets of each cell
+    boundaries = [h3.cell_to_boundary(h) for h in hex_ids]
+    nr_of_vertices = np.fromiter(
+        map(len, boundaries), dtype=np.int64, count=nr_of_hexes
+    )
+    offsets = np.zeros(nr_of_hexes + 1, dtype=np.int64)
+    np.cumsum(nr_of_vertices, out=offsets[1:])
+    # ATTENTION: (lat, lng)! pairs
+    lat_lng = np.concatenate(boundaries)
+    # NOTE: truncating conversion identical to coord2int()
+    coords_all = (lat_lng[:, ::-1].T * COORD2INT_FACTOR).astype(
+        DTYPE_FORMAT_SIGNED_I_NUMPY
+    )
+    ids = np.asarray(hex_ids, dtype=np.uint64)
+    surr_n_pole = ids == N_POLE_CELLS[res]
+    surr_s_pole = ids == S_POLE_CELLS[res]
+    bounds, x_overflow = corrected_hex_boundaries(
+        coords_all, offsets, surr_n_pole, surr_s_pole, MAX_LAT_INT, MAX_LNG_INT
+    )
+    cell_coords = np.split(coords_all, offsets[1:-1], axis=1)
+    return [
+        Hex(
+            int(hex_id),
+            res,
+            np.ascontiguousarray(coords),
+            Boundaries(*cell_bounds),
+            overflow,
+            n_pole,
+            s_pole,
+        )
+        for hex_id, coords, cell_bounds, overflow, n_pole, s_pole in zip(
+            hex_ids,
+            cell_coords,
+            zip(*bounds.tolist()),
+            x_overflow.tolist(),
+            surr_n_pole.tolist(),
+            surr_s_pole.tolist(),
+        )
+    ]
 
 
-@functools.lru_cache(maxsize=int(1e6))
 def get_hex(hex_id: int) -> Hex:
-    # NOTE: do not evaluate constructor when value has been stored already!
-    # return id2hex.get(hex_id) or id2hex.setdefault(hex_id, Hex.from_id(hex_id))
-    return Hex.from_id(hex_id)
+    """constructs a single hex cell"""
+    return build_hexes_bulk([hex_id])[0]
 
 
-def optimise_shortcut_ordering(poly_ids: List[int]) -> List[int]:
+def optimise_shortcut_ordering(poly_ids: Sequence[int]) -> Sequence[int]:
     """optimises the order of polygon ids for faster timezone checks
 
     observation: as soon as just polygons of one zone are left, this zone can be returned
@@ -530,61 +725,131 @@ def optimise_shortcut_ordering(poly_ids: List[int]) -> List[int]:
     -> sort the list of polygon ids in each shortcut after the size of the corresponding polygons
     """
     if len(poly_ids) <= 1:
+        # nothing to sort, the (immutable) input can be used as is
         return poly_ids
-    global polygon_lengths
 
-    poly_sizes = [polygon_lengths[i] for i in poly_ids]
-    zone_ids = [poly_zone_ids[i] for i in poly_ids]
-    zone_ids_unique = list(set(zone_ids))
-    zipped = list(zip(poly_ids, zone_ids, poly_sizes))
-    zone2size = {
-        i: sum(map(lambda e: e[2], filter(lambda e: e[1] == i, zipped)))
-        for i in zone_ids_unique
-    }
-    zone_ids_sorted = sorted(zone_ids_unique, key=lambda x: zone2size[x])
-    poly_ids_sorted = []
-    for zone_id in zone_ids_sorted:
-        # smaller polygons can be ruled out faster -> smaller polygons should come first
-        zone_entries = filter(lambda e: e[1] == zone_id, zipped)
-        zone_entries_sorted = sorted(zone_entries, key=lambda x: x[2])
-        zone_poly_ids_sorted, _, _ = zip(*zone_entries_sorted)
-        poly_ids_sorted += list(zone_poly_ids_sorted)
+    poly_id_arr = np.asarray(poly_ids, dtype=np.int64)
+    # NOTE: gather the polygon sizes and zones once and sort with NumPy
+    # instead of grouping and calling Python level key functions for every comparison
+    poly_sizes = polygon_lengths[poly_id_arr]
+    zone_ids = poly_zone_ids[poly_id_arr]
+    zones, zone_idx = np.unique(zone_ids, return_inverse=True)
+    zone_sizes = np.bincount(zone_idx, weights=poly_sizes)[zone_idx]
+    # primary key: total size of the zone, smaller zones can be ruled out faster
+    # the zone id keeps the polygons of zones with equal size grouped together
+    # smaller polygons can be ruled out faster -> smaller polygons should come first
+    order = np.lexsort((poly_sizes, zone_ids, zone_sizes))
+    # IMPORTANT: the query code relies on the polygons of every zone being grouped together
+    # -> the zone may only change once between every pair of zones
+    nr_of_zone_changes = np.count_nonzero(np.diff(zone_ids[order]))
+    assert nr_of_zone_changes == len(zones) - 1, "polygons of a zone are not grouped"
+    poly_ids_sorted = poly_id_arr[order]
     return poly_ids_sorted
 
 
-def compile_h3_map(candidates: Set) -> ShortcutMapping:
+def _worker_state() -> Dict[str, object]:
+    """the parsed data required for computing the polygons within a hex cell"""
+    return {
+        "nr_of_polygons": nr_of_polygons,
+        "nr_of_zones": nr_of_zones,
+        "poly_coords_flat": poly_coords_flat,
+        "poly_offsets": poly_offsets,
+        "polygon_lengths": polygon_lengths,
+        "poly_bounds_arr": poly_bounds_arr,
+        "poly_ids_of_band": poly_ids_of_band,
+        "poly_zone_ids": poly_zone_ids,
+        "first_hole_of_poly": first_hole_of_poly,
+        "hole_coords_flat": hole_coords_flat,
+        "hole_offsets": hole_offsets,
+        "hole_bounds_arr": hole_bounds_arr,
+    }
+
+
+def _init_worker(state: Dict[str, object]):
+    """stores the parsed data once per worker process (instead of sending it with every task)
+
+    NOTE: required when worker processes are not forked (e.g. "spawn" start method on macOS and Windows)
+    and hence do not inherit the module globals of the main process
+    NOTE: only the contiguous coordinate buffers are being transferred, the views of every ring are rebuilt
+    """
+    global polygons, holes
+    globals().update(state)
+    polygons = _ring_views(poly_coords_flat, poly_offsets)
+    holes = _ring_views(hole_coords_flat, hole_offsets)
+
+
+def _process_hexes(hex_ids: Sequence[int]) -> List[Tuple[int, Sequence[int]]]:
+    # NOTE: the cells of the target resolution are not required again -> no caching
+    return [
+        (cell.id, optimise_shortcut_ordering(cell.polys_in_cell))
+        for cell in build_hexes_bulk(hex_ids)
+    ]
+
+
+def iter_h3_map(
+    candidates: np.ndarray, nr_of_workers: Optional[int] = NR_OF_WORKERS
+) -> Iterator[List[Tuple[int, Sequence[int]]]]:
     """
     operate on one hex resolution
-    also store results separately to divide the output data files
+    yields the shortcut entries of one chunk of cells at a time (in the order of the candidates)
+
+    :param candidates: the ids of all hex cells to process in H3 index order
+
+    the cells are processed independently from each other -> distributed among multiple worker processes.
     """
-    mapping: ShortcutMapping = {}
     total_candidates = len(candidates)
+    processed = 0
 
-    def report_progress():
-        nr_candidates = len(candidates)
-        processed = total_candidates - nr_candidates
+    def report_progress(processed: int):
+        nr_candidates = total_candidates - processed
         print(
             f"\r{processed:,} processed\t{nr_candidates:,} remaining\t",
             end="",
         )
 
-    while candidates:
-        hex_id = candidates.pop()
-        cell = get_hex(hex_id)
-        polys = list(cell.polys_in_cell)
-        mapping[hex_id] = optimise_shortcut_ordering(polys)
-        report_progress()
-
-    return mapping
-
+    # NOTE: process the cells in H3 index order instead of (arbitrary) set order.
+    # the ids of cells with the same parent are adjacent in this order
+    # -> spatially close cells sharing the same polygon candidates are processed in succession
+    # NOTE: chunks of adjacent cells are being sent to the same worker to preserve this locality
+    # the cells of each chunk are being constructed at once
+    # NOTE: lazily convert one chunk at a time instead of holding all ids as Python ints at once
+    chunks = (
+        candidates[i : i + WORKER_CHUNK_SIZE].tolist()
+        for i in range(0, total_candidates, WORKER_CHUNK_SIZE)
+    )
+    try:
+        if nr_of_workers == 1:
+            for chunk_results in map(_process_hexes, chunks):
+                processed += len(chunk_results)
+                report_progress(processed)
+                yield chunk_results
+            return
 
-def all_res_candidates(res: int) -> HexIdSet:
+        with multiprocessing.Pool(
+            processes=nr_of_workers,
+            initializer=_init_worker,
+            initargs=(_worker_state(),),
+        ) as pool:
+            # NOTE: ordered results keep the output deterministic
+            for chunk_results in pool.imap(_process_hexes, chunks):
+                processed += len(chunk_results)
+                report_progress(processed)
+                yield chunk_results
+    finally:
+        # the cached cells of the polygon points are not required any more, free the memory
+        _vertex_cell_cache.clear()
+
+
+def all_res_candidates(res: int) -> np.ndarray:
+    """returns: the ids of all hex cells of the given resolution in H3 index order"""
     print(f"compiling hex candidates for resolution {res}.")
-    if res == 0:
-        return set(h3.get_res0_cells())
-    parent_res_candidates = all_res_candidates(res - 1)
-    child_iter = (h3.cell_to_children(h) for h in parent_res_candidates)
-    return set(itertools.chain.from_iterable(child_iter))
+    # NOTE: expanding all root cells with a single bulk call runs entirely within the h3 C library
+    # instead of calling cell_to_children() once per parent cell of every lower resolution
+    candidates = h3.uncompact_cells(h3.get_res0_cells(), res)
+    assert len(candidates) == h3.get_num_cells(res)
+    # NOTE: keep the cells in a compact array instead of a set of Python ints
+    candidates.sort()
+    return candidates
 
 
 @time_execution
@@ -602,10 +867,15 @@ def compile_shortcut_mapping(output_path: Path) -> int:
         "storing mapping to timezone polygons for every hexagon candidate at this resolution (-> 'full coverage')"
     )
     path2shortcut_file = Path(output_path) / SHORTCUT_FILE
-    shortcuts = compile_h3_map(candidates=candidates)
-    print_shortcut_statistics(shortcuts, poly_zone_ids)
-    shortcut_space = export_shortcuts_binary(shortcuts, path2shortcut_file)
-    validate_shortcut_mapping(shortcuts)
+    shortcut_space = 0
+    validator = ShortcutMappingValidator()
+    # NOTE: write the entries to the output file as soon as they have been computed
+    # instead of accumulating the whole mapping in memory first
+    with open(path2shortcut_file, "wb") as fp:
+        for chunk_results in iter_h3_map(candidates):
+            shortcut_space += write_shortcut_entries(fp, chunk_results)
+            validator.update(chunk_results)
+    validator.finish()
     return shortcut_space
 
 
@@ -613,55 +883,120 @@ def latlng_to_cell(lng: float, lat: float) -> int:
     return h3.latlng_to_cell(lat, lng, SHORTCUT_H3_RES)
 
 
-def validate_shortcut_completeness(mapping: ShortcutMapping):
-    print("validating shortcut completeness...")
+def compile_expected_entries() -> Dict[int, Dict[int, int]]:
+    """
+    every polygon must appear in the shortcut entries of all cells containing any of its points
 
-    error = False
+    returns: for every cell containing polygon points the ids of these polygons
+        together with the index of their first point within the cell (for reporting)
+    """
+    print("compiling the expected shortcut entries of all polygon points...")
+    expected_entries: Dict[int, Dict[int, int]] = {}
     for poly_id, poly in enumerate(polygons):
-        print(f"\rvalidating polygon {poly_id}", end="")
-        for i, pt in enumerate(poly.T):
-            # ATTENTION: int to coord conversion required!
-            lng = int2coord(pt[0])
-            lat = int2coord(pt[1])
-            hex_id = latlng_to_cell(lng, lat)
-            try:
-                shortcut_entries = mapping[hex_id]
-            except KeyError:
-                raise ValueError(
-                    f"shortcut mapping is incomplete at point ({lng}, {lat}) "
-                    f"(hexagon cell id {hex_id} missing in mapping)"
-                )
-            if poly_id not in shortcut_entries:
-                print(
-                    f"ERR: point #{i} ({lng}, {lat}) of polygon {poly_id} "
-                    f"does not appear in shortcut entries {shortcut_entries} of cell {hex_id}"
-                )
-                error = True
+        # ATTENTION: int to coord conversion required!
+        lngs = (poly[0] * INT2COORD_FACTOR).tolist()
+        lats = (poly[1] * INT2COORD_FACTOR).tolist()
+        hex_ids = map(latlng_to_cell, lngs, lats)
+        # NOTE: consecutive points mostly lie within the same cell
+        # -> check every cell only once (remembering its first point for reporting)
+        for i, hex_id in enumerate(hex_ids):
+            expected_entries.setdefault(hex_id, {}).setdefault(poly_id, i)
+    return expected_entries
+
+
+def polygon_point(poly_id: int, i: int) -> Tuple[float, float]:
+    """returns: the (lng, lat) coordinates of the i-th point of a polygon"""
+    poly = polygons[poly_id]
+    return float(poly[0, i] * INT2COORD_FACTOR), float(poly[1, i] * INT2COORD_FACTOR)
+
+
+def validate_shortcut_entries(
+    hex_id: int, poly_ids: Sequence[int], expected_entries: Dict[int, int]
+) -> bool:
+    """returns: True if the shortcut entries of the cell contain all polygons with points within the cell"""
+    valid = True
+    shortcut_entries = set(poly_ids)
+    for poly_id, i in expected_entries.items():
+        if poly_id not in shortcut_entries:
+            lng, lat = polygon_point(poly_id, i)
+            print(
+                f"\nERR: point #{i} ({lng}, {lat}) of polygon {poly_id} "
+                f"does not appear in shortcut entries {list(poly_ids)} of cell {hex_id}"
+            )
+            valid = False
+    return valid
+
 
-    assert not error
+def validate_shortcut_completeness(expected_entries: Dict[int, Dict[int, int]]):
+    """
+    :param expected_entries: the expected entries of all cells which do not appear in the mapping
+    """
+    if len(expected_entries) > 0:
+        hex_id, poly_entries = next(iter(expected_entries.items()))
+        poly_id, i = next(iter(poly_entries.items()))
+        lng, lat = polygon_point(poly_id, i)
+        raise ValueError(
+            f"shortcut mapping is incomplete at point ({lng}, {lat}) "
+            f"(hexagon cell id {hex_id} missing in mapping)"
+        )
 
 
-def validate_shortcut_resolution(mapping: ShortcutMapping):
-    for hex_id in mapping.keys():
+def validate_shortcut_resolution(hex_ids: Iterable[int]):
+    for hex_id in hex_ids:
         assert h3.get_resolution(hex_id) == SHORTCUT_H3_RES
 
 
-def validate_unused_polygons(shortcuts: ShortcutMapping):
-    used_polygons = set()
-    for poly_ids in shortcuts.values():
-        used_polygons.update(poly_ids)
-    all_polygon_ids = set(range(nr_of_polygons))
-    unused_poly_ids = all_polygon_ids - used_polygons
+def validate_unused_polygons(used_polygons: np.ndarray):
+    """
+    :param used_polygons: a flag for every polygon whether it appears in any shortcut
+    """
+    unused_poly_ids = set(np.flatnonzero(~used_polygons).tolist())
     assert len(unused_poly_ids) == 0, f"there are unused polygons: {unused_poly_ids}"
 
 
-@time_execution
-def validate_shortcut_mapping(mapping: ShortcutMapping):
-    print("validating shortcut mapping")
-    validate_shortcut_resolution(mapping)
-    validate_shortcut_completeness(mapping)
-    validate_unused_polygons(mapping)
-    assert not DEBUG, "DEBUG mode is on"
+class ShortcutMappingValidator:
+    """evaluates and validates the shortcut mapping one chunk of entries at a time
+
+    NOTE: the entries are being checked as soon as they have been computed
+    -> the whole mapping does not need to be held in memory (or read back from the output file)
+    """
+
+    def __init__(self):
+        self.expected_entries = compile_expected_entries()
+        self.used_polygons = np.zeros(nr_of_polygons, dtype=np.bool_)
+        self.nr_of_entries_in_shortcut = array("q")
+        self.amount_of_different_zones = array("q")
+        self.valid = True
+
+    def update(self, entries: List[Tuple[int, Sequence[int]]]):
+        hex_ids = [hex_id for hex_id, _ in entries]
+        validate_shortcut_resolution(hex_ids)
+        polygon_id_lists = [poly_ids for _, poly_ids in entries]
+        nr_of_entries, nr_of_zones = shortcut_entry_counts(
+            polygon_id_lists, poly_zone_ids
+        )
+        self.nr_of_entries_in_shortcut.frombytes(nr_of_entries.tobytes())
+        self.amount_of_different_zones.frombytes(nr_of_zones.tobytes())
+        for hex_id, poly_ids in entries:
+            self.used_polygons[np.asarray(poly_ids, dtype=np.int64)] = True
+            expected_entries = self.expected_entries.pop(hex_id, None)
+            if expected_entries is not None:
+                self.valid &= validate_shortcut_entries(
+                    hex_id, poly_ids, expected_entries
+                )
+
+    @time_execution
+    def finish(self):
+        print_shortcut_statistics(
+            np.frombuffer(self.nr_of_entries_in_shortcut, dtype=np.int64),
+            np.frombuffer(self.amount_of_different_zones, dtype=np.int64),
+        )
+        print("validating shortcut mapping")
+        # all cells containing polygon points must have been processed
+        validate_shortcut_completeness(self.expected_entries)
+        assert self.valid
+        validate_unused_polygons(self.used_polygons)
+        assert not DEBUG, "DEBUG mode is on"
 
 
 @time_execution
@@ -688,7 +1023,7 @@ def compile_polygon_binaries(output_path):
     write_binary(
         output_path, POLY_ZONE_IDS, poly_zone_ids, upper_value_limit=nr_of_zones
     )
-    write_boundary_data(output_path, POLY_MAX_VALUES, poly_boundaries)
+    write_boundary_data(output_path, POLY_MAX_VALUES, poly_bounds_arr)
     write_coordinate_data(output_path, POLY_DATA, polygons)
     write_binary(
         output_path,
@@ -716,22 +1051,19 @@ def compile_polygon_binaries(output_path):
     # store for which polygons (how many) holes exits and the id of the first of those holes
     # since there are very few it is feasible to keep them in memory
     # -> export and import as json
-    hole_registry = {}
-    # read the polygon ids for all the holes
-    for i, poly_id in enumerate(polynrs_of_holes):
-        try:
-            amount_of_holes, hole_id = hole_registry[poly_id]
-            hole_registry.update(
-                {
-                    poly_id: (amount_of_holes + 1, hole_id),
-                }
-            )
-        except KeyError:
-            hole_registry.update(
-                {
-                    poly_id: (1, i),
-                }
-            )
+    # NOTE: the holes are sorted by polygon id
+    # -> the first occurrence of a polygon id is the id of its first hole
+    poly_ids, first_hole_ids, amounts_of_holes = np.unique(
+        polynrs_of_holes,
+        return_index=True,
+        return_counts=True,
+    )
+    hole_registry = {
+        poly_id: (amount_of_holes, hole_id)
+        for poly_id, amount_of_holes, hole_id in zip(
+            poly_ids.tolist(), amounts_of_holes.tolist(), first_hole_ids.tolist()
+        )
+    }
 
     path = output_path / HOLE_REGISTRY_FILE
     write_json(hole_registry, path)
@@ -773,12 +1105,13 @@ def compile_polygon_binaries(output_path):
 def parse_data(
     input_path: Union[Path, str] = DEFAULT_INPUT_PATH,
     output_path: Union[Path, str] = DEFAULT_OUTPUT_PATH,
+    use_cache: bool = USE_PARSE_CACHE,
 ):
     input_path = Path(input_path)
     output_path = Path(output_path)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    polygon_space = parse_polygons_from_json(input_path)
+    polygon_space = load_polygons(input_path, use_cache)
     update_zone_names(output_path)
     hole_space = compile_polygon_binaries(output_path)
 
@@ -803,5 +1136,14 @@ if __name__ == "__main__":
         help="path to output folder for storing the parsed data files",
         default=DEFAULT_OUTPUT_PATH,
     )
+    parser.add_argument(
+        "-cache",
+        help="reuse the data parsed in a previous run (stored next to the input JSON file)",
+        action="store_true",
+    )
     parsed_args = parser.parse_args()  # takes input from sys.argv
-    parse_data(input_path=parsed_args.inp, output_path=parsed_args.out)
+    parse_data(
+        input_path=parsed_args.inp,
+        output_path=parsed_args.out,
+        use_cache=parsed_args.cache,
+    )
@@ -1,23 +1,55 @@
+import itertools
 import json
 import pickle
-import struct
+from array import array
 from os.path import abspath, join
 from time import time
-from typing import Dict, List
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
 
 import numpy as np
 
+from scripts.utils_numba import int_rings
+
 from timezonefinder import configs
-from timezonefinder.utils import coord2int
+from timezonefinder.utils import using_numba
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 def load_json(path):
     print("loading json from ", path)
-    with open(path) as fp:
-        obj = json.load(fp)
+    if orjson is None:
+        with open(path) as fp:
+            obj = json.load(fp)
+        return obj
+    # NOTE: orjson parses the large GeoJSON input considerably faster (optional dependency)
+    with open(path, "rb") as fp:
+        obj = orjson.loads(fp.read())
     return obj
 
 
+def iter_json_features(path) -> Iterator[dict]:
+    """yields the features of a GeoJSON feature collection one at a time
+
+    NOTE: the features are being streamed in case ijson is installed (optional dependency)
+    -> the parsed JSON is never held in memory as a whole
+    """
+    if ijson is None:
+        yield from load_json(path)["features"]
+        return
+    print("streaming json from ", path)
+    with open(path, "rb") as fp:
+        yield from ijson.items(fp, "features.item", use_float=True)
+
+
 def load_pickle(path):
     print("loading pickle from ", path)
     with open(path, "rb") as fp:
@@ -56,58 +88,104 @@ def percent(numerator, denominator):
     return round((numerator / denominator) * 100, 2)
 
 
-def to_numpy_polygon(coord_pairs, flipped: bool = False) -> np.ndarray:
-    if flipped:
-        y_coords1, x_coords1 = zip(*coord_pairs)
+def to_numpy_polygons(
+    coord_buffer: Union[array, np.ndarray], ring_lengths: Sequence[int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """converts the concatenated coordinates of multiple rings (polygons) at once
+
+    ATTENTION: the float values in the given buffer might be overwritten (scaled in place)
+
+    :param coord_buffer: the (x, y) coordinate pairs of all rings as a flat buffer of floats
+    :param ring_lengths: the amount of coordinate pairs in every ring
+    :return: the integer coordinates of all rings (2, N),
+        the amount of coordinates in every ring (without point repetition)
+        and the boundaries (xmax, xmin, ymax, ymin) of every ring (4, R)
+    """
+    pairs = np.frombuffer(coord_buffer, dtype=np.float64).reshape(-1, 2)
+    lengths = np.array(ring_lengths, dtype=np.int64)
+    if using_numba:
+        # NOTE: a single compiled pass without any intermediary copies of the coordinates
+        poly_coords, lengths, bounds = int_rings(pairs, lengths)
     else:
-        x_coords1, y_coords1 = zip(*coord_pairs)
-    x_coords = list(map(coord2int, x_coords1))
-    y_coords = list(map(coord2int, y_coords1))
-    if x_coords[0] == x_coords[-1] and y_coords[0] == y_coords[-1]:
+        # NOTE: scale in place to avoid another float64 copy of all coordinates
+        np.multiply(pairs, configs.COORD2INT_FACTOR, out=pairs)
+        # NOTE: truncating conversion identical to coord2int()
+        pairs = pairs.astype(configs.DTYPE_FORMAT_SIGNED_I_NUMPY)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
         # IMPORTANT: polygon are represented without point repetition at the end
         # -> do not use the last coordinate (only if equal to the first)!
-        x_coords.pop(-1)
-        y_coords.pop(-1)
-    assert len(x_coords) == len(y_coords)
-    assert len(x_coords) >= 3
-    poly = np.array((x_coords, y_coords), dtype=configs.DTYPE_FORMAT_SIGNED_I_NUMPY)
-    return poly
+        closed = np.all(pairs[starts] == pairs[ends - 1], axis=1)
+        keep = np.ones(len(pairs), dtype=bool)
+        keep[ends[closed] - 1] = False
+        lengths -= closed
+        poly_coords = np.ascontiguousarray(pairs[keep].T)
+        # NOTE: segmented reductions instead of a (not compiled) loop over all coordinates
+        starts = np.cumsum(lengths) - lengths
+        bounds = np.empty((4, len(lengths)), dtype=np.int64)
+        bounds[[0, 2]] = np.maximum.reduceat(poly_coords, starts, axis=1)
+        bounds[[1, 3]] = np.minimum.reduceat(poly_coords, starts, axis=1)
+    assert np.all(lengths >= 3)
+    return poly_coords, lengths, bounds
 
 
 def accumulated_frequency(int_list):
-    out = []
     total = sum(int_list)
-    acc = 0
-    for e in int_list:
-        acc += e
-        out.append(percent(acc, total))
-
-    return out
+    return [percent(acc, total) for acc in itertools.accumulate(int_list)]
+
+
+def shortcut_entry_counts(
+    polygon_id_lists: Sequence[Sequence[int]], poly_zone_ids: Sequence[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """returns: the amount of polygons and the amount of different zones in every given shortcut"""
+    amount_of_shortcuts = len(polygon_id_lists)
+    if amount_of_shortcuts == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # NOTE: collect the statistics of all shortcuts at once with vectorised operations
+    nr_of_entries_in_shortcut = np.fromiter(
+        map(len, polygon_id_lists), dtype=np.int64, count=amount_of_shortcuts
+    )
+    polygon_ids = np.concatenate(polygon_id_lists).astype(np.int64)
+    shortcut_ids = np.repeat(np.arange(amount_of_shortcuts), nr_of_entries_in_shortcut)
+    # TODO count and evaluate the appearance of the different zones
+    zone_ids = np.asarray(poly_zone_ids, dtype=np.int64)[polygon_ids]
+    # every distinct (shortcut, zone) combination encoded as a single integer
+    # NOTE: all shortcuts might be empty
+    nr_of_zones = int(zone_ids.max(initial=0)) + 1
+    distinct_zones = np.unique(shortcut_ids * nr_of_zones + zone_ids)
+    amount_of_different_zones = np.bincount(
+        distinct_zones // nr_of_zones, minlength=amount_of_shortcuts
+    )
+    return nr_of_entries_in_shortcut, amount_of_different_zones
 
 
-def print_shortcut_statistics(mapping: Dict[int, List[int]], poly_zone_ids: List[int]):
+def print_shortcut_statistics(
+    nr_of_entries_in_shortcut: np.ndarray, amount_of_different_zones: np.ndarray
+):
+    """
+    :param nr_of_entries_in_shortcut: the amount of polygons in every shortcut
+    :param amount_of_different_zones: the amount of different zones in every shortcut
+    """
     print("\n\nshortcut statistics:")
-    amount_of_shortcuts = len(mapping)
-    nr_of_entries_in_shortcut = [len(v) for v in mapping.values()]
+    amount_of_shortcuts = len(nr_of_entries_in_shortcut)
+    if amount_of_shortcuts == 0:
+        print("the mapping does not contain any shortcuts")
+        return
+
     print("\namount of timezone polygons per shortcut")
     print_frequencies(nr_of_entries_in_shortcut, amount_of_shortcuts)
 
-    amount_of_different_zones = []
-    for polygon_ids in mapping.values():
-        # TODO count and evaluate the appearance of the different zones
-        zone_ids = [poly_zone_ids[i] for i in polygon_ids]
-        distinct_zones = set(zone_ids)
-        amount_of_distinct_zones = len(distinct_zones)
-        amount_of_different_zones.append(amount_of_distinct_zones)
-
     print("amount of different timezones per shortcut")
     print_frequencies(amount_of_different_zones, amount_of_shortcuts)
 
 
 def print_frequencies(counts: List[int], amount_of_shortcuts: int):
-    max_val = max(*counts)
+    counts = np.asarray(counts, dtype=np.int64)
+    max_val = int(counts.max())
     print("highest amount in one shortcut is", max_val)
-    frequencies = [counts.count(i) for i in range(max_val + 1)]
+    # NOTE: count the occurrences of all values in a single pass
+    # instead of scanning all counts once for every possible value
+    frequencies = np.bincount(counts).tolist()
     nr_empty_shortcuts = frequencies[0]
     print(
         percent(nr_empty_shortcuts, amount_of_shortcuts),
@@ -134,47 +212,54 @@ def export_mapping(file_name: str, obj: Dict, res: int):
     write_json(json_mapping, f"{file_name}_res{res}.json")
 
 
-def write_value(output_file, value, data_format, lower_value_limit, upper_value_limit):
-    assert value > lower_value_limit, (
-        f"trying to write value {value} subceeding lower limit {lower_value_limit} (data type {data_format})"
+def check_value_range(
+    values: np.ndarray, data_format, lower_value_limit, upper_value_limit
+):
+    """asserts that all values lie within the value range of the data type (limits excluded)"""
+    if values.size == 0:
+        return
+    min_value = values.min()
+    assert min_value > lower_value_limit, (
+        f"trying to write value {min_value} subceeding lower limit {lower_value_limit} (data type {data_format})"
     )
-    assert value < upper_value_limit, (
-        f"trying to write value {value} exceeding upper limit {upper_value_limit} (data type {data_format})"
+    max_value = values.max()
+    assert max_value < upper_value_limit, (
+        f"trying to write value {max_value} exceeding upper limit {upper_value_limit} (data type {data_format})"
     )
-    output_file.write(struct.pack(data_format, value))
 
 
-def write_coordinate_value(output_file, coord_as_int):
+def write_regular(output_file, data, data_format, lower_value_limit, upper_value_limit):
+    # NOTE: check and write all values at once instead of packing every single value separately
+    values = np.asarray(data, dtype=np.int64)
+    check_value_range(values, data_format, lower_value_limit, upper_value_limit)
+    # the struct format characters (e.g. '<H') are valid numpy type strings
+    output_file.write(values.astype(np.dtype(data_format.decode())).tobytes())
+
+
+def write_coordinate_values(output_file, coords_as_int: np.ndarray):
     # NOTE: float coordinates are assumed to have been converted into int32 already
-    write_value(
-        output_file,
-        coord_as_int,
+    # NOTE: write all values at once instead of packing every single value separately
+    check_value_range(
+        coords_as_int,
         data_format=configs.DTYPE_FORMAT_SIGNED_I,
         lower_value_limit=configs.THRES_DTYPE_SIGNED_I_LOWER,
         upper_value_limit=configs.THRES_DTYPE_SIGNED_I_UPPER,
     )
-
-
-def write_regular(output_file, data, *args, **kwargs):
-    for value in data:
-        write_value(output_file, value, *args, **kwargs)
+    # ATTENTION: the values are being written in row major (C) order
+    values = np.asarray(coords_as_int, dtype=configs.DTYPE_FORMAT_SIGNED_I_NUMPY)
+    output_file.write(values.tobytes(order="C"))
 
 
 def write_coordinates(output_file, data, *args, **kwargs):
-    for x_coords, y_coords in data:
-        for x in x_coords:
-            write_coordinate_value(output_file, x)
-
-        for y in y_coords:
-            write_coordinate_value(output_file, y)
+    # data: (2, N) array for every polygon -> first all x then all y values
+    for coords in data:
+        write_coordinate_values(output_file, coords)
 
 
-def write_boundaries(output_file, boundaries: List, *args, **kwargs):
-    for boundary in boundaries:
-        write_coordinate_value(output_file, boundary.xmax)
-        write_coordinate_value(output_file, boundary.xmin)
-        write_coordinate_value(output_file, boundary.ymax)
-        write_coordinate_value(output_file, boundary.ymin)
+def write_boundaries(output_file, boundaries: np.ndarray, *args, **kwargs):
+    # boundaries: (4, N) array with the rows xmax, xmin, ymax, ymin
+    # -> the transposed array holds the 4 values of every polygon in succession
+    write_coordinate_values(output_file, boundaries.T)
 
 
 def write_binary(
@@ -0,0 +1,206 @@
+"""JIT compiled helper functions for compiling the shortcut mapping
+
+compiled in case `numba` is installed
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from timezonefinder.configs import COORD2INT_FACTOR
+from timezonefinder.utils import pt_in_poly_python
+
+try:
+    from numba import njit
+except ImportError:
+    # replace Numba functionality with "transparent" implementations
+    from timezonefinder._numba_replacements import njit
+
+
+@njit(cache=True)
+def hex_pts_in_polys(
+    hex_coords: np.ndarray,
+    poly_coords: np.ndarray,
+    poly_offsets: np.ndarray,
+    poly_ids: np.ndarray,
+) -> np.ndarray:
+    """checks for multiple polygons at once if any point of a hex cell lies within them
+
+    :param hex_coords: the coordinates of the hex cell (2, V)
+    :param poly_coords: the coordinates of all polygons concatenated (2, N)
+    :param poly_offsets: the index of the first coordinate of every polygon
+        plus one more entry for knowing where the last polygon ends
+    :param poly_ids: the ids of the polygons to check
+    :return: True for every given polygon containing a point of the hex cell
+    """
+    nr_of_polys = len(poly_ids)
+    nr_of_pts = hex_coords.shape[1]
+    results = np.zeros(nr_of_polys, dtype=np.bool_)
+    for i in range(nr_of_polys):
+        poly_id = poly_ids[i]
+        poly = poly_coords[:, poly_offsets[poly_id] : poly_offsets[poly_id + 1]]
+        for j in range(nr_of_pts):
+            if pt_in_poly_python(hex_coords[0, j], hex_coords[1, j], poly):
+                results[i] = True
+                break
+    return results
+
+
+@njit(cache=True)
+def int_rings(
+    pairs: np.ndarray, ring_lengths: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """converts the float coordinates of multiple rings (polygons) into integers in a single pass
+
+    NOTE: the boundaries of every ring are being computed in the same pass
+    NOTE: truncating conversion identical to coord2int()
+    IMPORTANT: polygon are represented without point repetition at the end
+    -> do not use the last coordinate (only if equal to the first)!
+
+    :param pairs: the (x, y) coordinate pairs of all rings concatenated (N, 2)
+    :param ring_lengths: the amount of coordinate pairs in every ring
+    :return: the integer coordinates of all rings (2, M),
+        the amount of coordinates in every ring (without point repetition)
+        and the boundaries (xmax, xmin, ymax, ymin) of every ring (4, R)
+    """
+    nr_of_rings = len(ring_lengths)
+    lengths = np.empty(nr_of_rings, dtype=np.int64)
+    start = 0
+    for i in range(nr_of_rings):
+        end = start + ring_lengths[i] - 1
+        closed = np.int32(pairs[start, 0] * COORD2INT_FACTOR) == np.int32(
+            pairs[end, 0] * COORD2INT_FACTOR
+        ) and np.int32(pairs[start, 1] * COORD2INT_FACTOR) == np.int32(
+            pairs[end, 1] * COORD2INT_FACTOR
+        )
+        lengths[i] = ring_lengths[i] - closed
+        start += ring_lengths[i]
+
+    coords = np.empty((2, lengths.sum()), dtype=np.int32)
+    bounds = np.empty((4, nr_of_rings), dtype=np.int64)
+    start = 0
+    pos = 0
+    for i in range(nr_of_rings):
+        first = pos
+        for j in range(start, start + lengths[i]):
+            coords[0, pos] = np.int32(pairs[j, 0] * COORD2INT_FACTOR)
+            coords[1, pos] = np.int32(pairs[j, 1] * COORD2INT_FACTOR)
+            pos += 1
+        start += ring_lengths[i]
+        # NOTE: the coordinates of the ring have just been written and are still cached
+        xmax = xmin = np.int64(coords[0, first])
+        ymax = ymin = np.int64(coords[1, first])
+        for j in range(first + 1, pos):
+            x = np.int64(coords[0, j])
+            y = np.int64(coords[1, j])
+            if x > xmax:
+                xmax = x
+            elif x < xmin:
+                xmin = x
+            if y > ymax:
+                ymax = y
+            elif y < ymin:
+                ymin = y
+        bounds[0, i] = xmax
+        bounds[1, i] = xmin
+        bounds[2, i] = ymax
+        bounds[3, i] = ymin
+    return coords, lengths, bounds
+
+
+@njit(cache=True)
+def ring_boundaries(coords: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """computes the boundaries of multiple rings (polygons) at once
+
+    NOTE: using 64 bit integers to prevent overflow in later computations
+
+    :param coords: the coordinates of all rings concatenated (2, N)
+    :param offsets: the index of the first coordinate of every ring
+        plus one more entry for knowing where the last ring ends
+    :return: the boundaries (xmax, xmin, ymax, ymin) of every ring (4, M)
+    """
+    nr_of_rings = len(offsets) - 1
+    bounds = np.empty((4, nr_of_rings), dtype=np.int64)
+    for i in range(nr_of_rings):
+        start = offsets[i]
+        xmax = xmin = np.int64(coords[0, start])
+        ymax = ymin = np.int64(coords[1, start])
+        for j in range(start + 1, offsets[i + 1]):
+            x = np.int64(coords[0, j])
+            y = np.int64(coords[1, j])
+            if x > xmax:
+                xmax = x
+            elif x < xmin:
+                xmin = x
+            if y > ymax:
+                ymax = y
+            elif y < ymin:
+                ymin = y
+        bounds[0, i] = xmax
+        bounds[1, i] = xmin
+        bounds[2, i] = ymax
+        bounds[3, i] = ymin
+    return bounds
+
+
+@njit(cache=True)
+def corrected_hex_boundaries(
+    coords: np.ndarray,
+    offsets: np.ndarray,
+    surr_n_pole: np.ndarray,
+    surr_s_pole: np.ndarray,
+    max_latitude: int,
+    max_longitude: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """boundaries of hex cells used for pre-filtering the polygons
+        which have to be checked with expensive point-in-polygon algorithm
+
+    ATTENTION: a h3 polygon may cross the boundaries of the lat/lng coordinate plane (only in lng=x direction)
+    -> cannot use usual geometry assumptions (polygon algorithm, min max boundary check etc.)
+    -> rectify boundaries
+
+    ATTENTION: only using coordinates converted to integers!
+    NOTE: use 64 bit integers to prevent overflow
+
+    Observation: except for cells close to the poles,
+        h3 hexagons can usually only span a fraction of the globe (<< 360 degree lng)
+    high longitude difference observed without surrounding a pole
+    -> indicates crossing the +-180 deg lng boundary
+    ATTENTION: min and max of the coordinates would only  pick the points closest to the +-180 deg lng boundary,
+      but not the points furthest apart!
+    getting this "pre-filtering" based on boundaries right across the +-180 deg lng boundary is tricky
+        -> do not exclude any longitudes for simplicity and correctness
+    this is only relevant for a fraction of hex cells plus filtering will still happen based on the latitude!
+
+    :param coords: the coordinates of all hex cells concatenated (2, N)
+    :param offsets: the index of the first coordinate of every cell
+        plus one more entry for knowing where the last cell ends
+    :return: the boundaries (xmax, xmin, ymax, ymin) of every cell (4, M)
+        and whether each cell crosses the +-180 deg lng boundary
+    """
+    bounds = ring_boundaries(coords, offsets)
+    nr_of_hexes = len(offsets) - 1
+    x_overflow = np.empty(nr_of_hexes, dtype=np.bool_)
+    for i in range(nr_of_hexes):
+        xmax, xmin, ymax, ymin = bounds[0, i], bounds[1, i], bounds[2, i], bounds[3, i]
+        assert ymax - ymin < max_latitude, "latitude difference too high"
+        overflow = xmax - xmin > max_longitude
+
+        if surr_n_pole[i]:
+            # clip to max lat
+            ymax = max_latitude
+        elif surr_s_pole[i]:
+            # clip to min lat
+            ymin = -max_latitude
+
+        if surr_n_pole[i] or surr_s_pole[i] or overflow:
+            # search all lngs for cells close to the poles or crossing the +-180 deg lng boundary
+            xmin = -max_longitude
+            xmax = max_longitude
+
+        bounds[0, i] = xmax
+        bounds[1, i] = xmin
+        bounds[2, i] = ymax
+        bounds[3, i] = ymin
+        x_overflow[i] = overflow
+    return bounds, x_overflow
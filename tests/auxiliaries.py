@@ -1,7 +1,7 @@
 import random
 import timeit
 from math import log10
-from typing import Callable, Tuple
+from typing import Callable, List, Tuple
 
 import numpy as np
 
@@ -54,6 +54,13 @@ def get_rnd_query_pt() -> Tuple[float, float]:
     return lng, lat
 
 
+def get_rnd_query_pts(length: int) -> List[Tuple[float, float]]:
+    # NOTE: draw all random coordinates at once instead of every single point separately
+    lngs = np.random.uniform(-MAX_LNG_VAL, MAX_LNG_VAL, length)
+    lats = np.random.uniform(-MAX_LAT_VAL, MAX_LAT_VAL, length)
+    return list(zip(lngs.tolist(), lats.tolist()))
+
+
 def get_rnd_poly_int() -> np.ndarray:
     max_poly_id = tf_instance.nr_of_polygons - 1
     poly_id = random.randint(0, max_poly_id)
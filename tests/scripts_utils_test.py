@@ -0,0 +1,112 @@
+import shutil
+from array import array
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from scripts import utils
+from timezonefinder import TimezoneFinder
+from timezonefinder.configs import (
+    BINARY_FILE_ENDING,
+    DTYPE_FORMAT_I,
+    POLY_COORD_AMOUNT,
+    POLY_DATA,
+    POLY_MAX_VALUES,
+    POLY_ZONE_IDS,
+    THRES_DTYPE_I,
+)
+from timezonefinder.utils import coord2int
+
+PACKAGE_DATA_DIR = Path(__file__).parent.parent / "timezonefinder"
+
+CLOSED_RING = [(0.5, 0.5), (-0.5, 0.5), (-0.5, -0.5), (0.5, -0.5), (0.5, 0.5)]
+OPEN_RING = [(10.1, 20.2), (-10.3, 20.4), (-10.5, -20.6), (10.7, -20.8)]
+EXTREME_RING = [(180.0, 90.0), (-180.0, 90.0), (-180.0, -90.0), (180.0, -90.0)]
+NEGATIVE_RING = [(-1e-7, -2.9e-7), (-3.123456789, -1.5), (-0.1, -7.7), (-1e-7, -2.9e-7)]
+
+RING_TESTCASES = [
+    [CLOSED_RING],
+    [OPEN_RING],
+    [CLOSED_RING, OPEN_RING, EXTREME_RING, NEGATIVE_RING],
+    [OPEN_RING, NEGATIVE_RING, OPEN_RING, CLOSED_RING],
+]
+
+
+def convert_rings_python(
+    rings: List[List[Tuple[float, float]]],
+) -> Tuple[List[List[int]], List[int], List[List[int]]]:
+    """the reference implementation converting every single coordinate separately"""
+    x_coords, y_coords, lengths = [], [], []
+    bounds = [[], [], [], []]
+    for ring in rings:
+        xs = [coord2int(x) for x, _ in ring]
+        ys = [coord2int(y) for _, y in ring]
+        if xs[0] == xs[-1] and ys[0] == ys[-1]:
+            xs.pop(-1)
+            ys.pop(-1)
+        x_coords.extend(xs)
+        y_coords.extend(ys)
+        lengths.append(len(xs))
+        for i, value in enumerate((max(xs), min(xs), max(ys), min(ys))):
+            bounds[i].append(value)
+    return [x_coords, y_coords], lengths, bounds
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+@pytest.mark.parametrize("rings", RING_TESTCASES)
+def test_to_numpy_polygons(monkeypatch, use_numba: bool, rings):
+    if use_numba:
+        pytest.importorskip("numba")
+    # both implementations must yield the same results
+    monkeypatch.setattr(utils, "using_numba", use_numba)
+    coord_buffer = array("d", (value for ring in rings for pt in ring for value in pt))
+    ring_lengths = [len(ring) for ring in rings]
+
+    poly_coords, lengths, bounds = utils.to_numpy_polygons(coord_buffer, ring_lengths)
+
+    expected_coords, expected_lengths, expected_bounds = convert_rings_python(rings)
+    assert poly_coords.shape == (2, sum(expected_lengths))
+    np.testing.assert_array_equal(poly_coords, expected_coords)
+    np.testing.assert_array_equal(lengths, expected_lengths)
+    np.testing.assert_array_equal(bounds, expected_bounds)
+
+
+def test_write_read_round_trip(tmp_path):
+    """the data written by the build utils must be read back unchanged by TimezoneFinder"""
+    for path in PACKAGE_DATA_DIR.iterdir():
+        if path.suffix in (BINARY_FILE_ENDING, ".json"):
+            shutil.copy(path, tmp_path)
+    tf = TimezoneFinder()
+    poly_ids = range(tf.nr_of_polygons)
+    polygons = [tf.coords_of(poly_id) for poly_id in poly_ids]
+    boundaries = np.array([tf.get_polygon_boundaries(i) for i in poly_ids]).T
+    zone_ids = [tf.zone_id_of(poly_id) for poly_id in poly_ids]
+
+    # overwrite the copied data files
+    utils.write_coordinate_data(tmp_path, POLY_DATA, polygons)
+    utils.write_boundary_data(tmp_path, POLY_MAX_VALUES, boundaries)
+    utils.write_binary(
+        tmp_path, POLY_ZONE_IDS, zone_ids, upper_value_limit=tf.nr_of_zones
+    )
+    utils.write_binary(
+        tmp_path,
+        POLY_COORD_AMOUNT,
+        [poly.shape[1] for poly in polygons],
+        data_format=DTYPE_FORMAT_I,
+        upper_value_limit=THRES_DTYPE_I,
+    )
+    for file_name in (POLY_DATA, POLY_MAX_VALUES, POLY_ZONE_IDS, POLY_COORD_AMOUNT):
+        file_name += BINARY_FILE_ENDING
+        written = (tmp_path / file_name).read_bytes()
+        assert written == (PACKAGE_DATA_DIR / file_name).read_bytes()
+
+    tf_written = TimezoneFinder(bin_file_location=tmp_path)
+    assert tf_written.nr_of_polygons == tf.nr_of_polygons
+    for poly_id in poly_ids:
+        np.testing.assert_array_equal(tf_written.coords_of(poly_id), polygons[poly_id])
+        np.testing.assert_array_equal(
+            tf_written.get_polygon_boundaries(poly_id), boundaries[:, poly_id]
+        )
+        assert tf_written.zone_id_of(poly_id) == zone_ids[poly_id]
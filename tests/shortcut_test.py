@@ -3,6 +3,7 @@ from typing import List
 
 import h3.api.numpy_int as h3
 import numpy as np
+import pytest
 
 from scripts import file_converter
 from timezonefinder import configs, hex_helpers
@@ -12,6 +13,10 @@ PATH2SHORTCUT_FILE = (
 )
 
 shortcuts = hex_helpers.read_shortcuts_binary(PATH2SHORTCUT_FILE)
+poly_zone_ids = np.fromfile(
+    PATH2SHORTCUT_FILE.parent / (configs.POLY_ZONE_IDS + configs.BINARY_FILE_ENDING),
+    dtype=configs.DTYPE_FORMAT_H_NUMPY,
+)
 
 
 def test_import_export():
@@ -68,6 +73,60 @@ def test_unique_pole_cells():
     )
 
 
+@pytest.mark.parametrize(
+    "lat, lng, lat_range, lng_range",
+    [
+        # cell on the antimeridian
+        (0.0, 180.0, (-5.0, 5.0), (-180.0, 180.0)),
+        # cells surrounding the poles
+        (90.0, 0.0, (80.0, 90.0), (-180.0, 180.0)),
+        (-90.0, 0.0, (-90.0, -80.0), (-180.0, 180.0)),
+        # regular cell at a high latitude (edges bulging towards the pole)
+        (70.0, 30.0, (67.0, 73.0), (24.0, 36.0)),
+    ],
+)
+def test_any_pt_in_cell(monkeypatch, lat, lng, lat_range, lng_range):
+    """the pre-filtered check must match testing the cells of all polygon points"""
+    res = configs.SHORTCUT_H3_RES
+    cell = file_converter.get_hex(h3.latlng_to_cell(lat, lng, res))
+    rng = np.random.default_rng(1234)
+    nr_of_pts = 5000
+    pts = np.array(
+        (rng.uniform(*lng_range, nr_of_pts), rng.uniform(*lat_range, nr_of_pts))
+    )
+    # also include points on the antimeridian and on the latitude limits
+    pts[0, :100] = 180.0
+    pts[0, 100:200] = -180.0
+    pts[1, 200:300] = lat_range[0] if lat < 0 else lat_range[1]
+    coords_flat = (pts * configs.COORD2INT_FACTOR).astype(
+        configs.DTYPE_FORMAT_SIGNED_I_NUMPY
+    )
+    offsets = np.arange(0, nr_of_pts + 1, 5, dtype=np.int64)
+    monkeypatch.setattr(file_converter, "poly_coords_flat", coords_flat)
+    monkeypatch.setattr(file_converter, "poly_offsets", offsets)
+    monkeypatch.setattr(
+        file_converter, "polygons", file_converter._ring_views(coords_flat, offsets)
+    )
+    monkeypatch.setattr(file_converter, "_vertex_cell_cache", {})
+
+    results = []
+    for poly_nr, (x_coords, y_coords) in enumerate(file_converter.polygons):
+        expected = any(
+            h3.latlng_to_cell(
+                y * configs.INT2COORD_FACTOR, x * configs.INT2COORD_FACTOR, res
+            )
+            == cell.id
+            for x, y in zip(x_coords.tolist(), y_coords.tolist())
+        )
+        assert file_converter.any_pt_in_cell(cell, poly_nr) == expected
+        results.append(expected)
+    # the test points must cover both cases
+    assert any(results) and not all(results)
+    # the cells of the points have been cached
+    for poly_nr, expected in enumerate(results):
+        assert file_converter.any_pt_in_cell(cell, poly_nr) == expected
+
+
 def has_coherent_sequences(lst: List[int]) -> bool:
     """
     :return: True if equal entries in the list are not separated by entries of other values
@@ -100,5 +159,34 @@ def test_has_coherent_sequences():
 
 
 def test_shortcut_sorting():
+    # the polygons of every zone must be grouped together in all shortcuts
+    # (e.g. required by TimezoneFinder.unique_zone_id())
     for polygon_ids in shortcuts.values():
-        assert has_coherent_sequences(polygon_ids)
+        zone_ids = poly_zone_ids[polygon_ids]
+        assert has_coherent_sequences(zone_ids.tolist())
+
+
+def test_optimise_shortcut_ordering(monkeypatch):
+    # zone 0: polygons 0 (size 10) and 3 (size 1) -> total size 11
+    # zone 1: polygon 1 (size 5) -> total size 5
+    # zone 2: polygons 2 (size 4) and 4 (size 3) -> total size 7
+    monkeypatch.setattr(
+        file_converter, "polygon_lengths", np.array([10, 5, 4, 1, 3], dtype=np.int64)
+    )
+    monkeypatch.setattr(
+        file_converter, "poly_zone_ids", np.array([0, 1, 2, 0, 2], dtype=np.int64)
+    )
+    poly_ids_sorted = file_converter.optimise_shortcut_ordering([0, 1, 2, 3, 4])
+    assert isinstance(poly_ids_sorted, np.ndarray)
+    np.testing.assert_equal(poly_ids_sorted, [1, 4, 2, 3, 0])
+    assert file_converter.optimise_shortcut_ordering((3,)) == (3,)
+
+    # zones of equal total size must not get mixed up
+    monkeypatch.setattr(
+        file_converter, "polygon_lengths", np.array([2, 2, 2, 2], dtype=np.int64)
+    )
+    monkeypatch.setattr(
+        file_converter, "poly_zone_ids", np.array([1, 0, 1, 0], dtype=np.int64)
+    )
+    poly_ids_sorted = file_converter.optimise_shortcut_ordering([0, 1, 2, 3])
+    np.testing.assert_equal(poly_ids_sorted, [1, 3, 0, 2])
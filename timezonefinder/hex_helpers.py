@@ -1,6 +1,6 @@
 import struct
 from pathlib import Path
-from typing import Dict, List
+from typing import BinaryIO, Dict, Iterable, List, Sequence, Tuple
 
 import numpy as np
 from h3.api import numpy_int as h3
@@ -29,18 +29,28 @@ def export_shortcuts_binary(
             - n polygon ids (uint16)
 
     """
-    shortcut_space = 0
     with open(path2shortcuts, "wb") as fp:
-        for hex_id, poly_ids in global_mapping.items():
-            fp.write(struct.pack(DTYPE_FORMAT_Q, hex_id))
-            nr_polys = len(poly_ids)
-            if nr_polys > THRES_DTYPE_B:
-                raise ValueError("value overflow: more polys than data type supports")
-            fp.write(struct.pack(DTYPE_FORMAT_B, nr_polys))
-            for poly_id in poly_ids:
-                fp.write(struct.pack(DTYPE_FORMAT_H, poly_id))
+        return write_shortcut_entries(fp, global_mapping.items())
+
+
+def write_shortcut_entries(
+    fp: BinaryIO, entries: Iterable[Tuple[int, Sequence[int]]]
+) -> int:
+    """writes shortcut entries in the binary format of export_shortcuts_binary()
+
+    NOTE: allows writing the entries incrementally (e.g. as soon as they have been computed)
+    """
+    shortcut_space = 0
+    for hex_id, poly_ids in entries:
+        fp.write(struct.pack(DTYPE_FORMAT_Q, hex_id))
+        nr_polys = len(poly_ids)
+        if nr_polys > THRES_DTYPE_B:
+            raise ValueError("value overflow: more polys than data type supports")
+        fp.write(struct.pack(DTYPE_FORMAT_B, nr_polys))
+        for poly_id in poly_ids:
+            fp.write(struct.pack(DTYPE_FORMAT_H, poly_id))
 
-            shortcut_space += NR_BYTES_Q + NR_BYTES_B + (len(poly_ids) * NR_BYTES_I)
+        shortcut_space += NR_BYTES_Q + NR_BYTES_B + (len(poly_ids) * NR_BYTES_I)
 
     return shortcut_space
 
@@ -1,4 +1,5 @@
 #include "inside_polygon_int.h"
+#include <stdint.h>
 #include <stdio.h>
 
 bool inside_polygon_int(int x, int y, int nr_coords, int x_coords[],
@@ -16,7 +17,8 @@ bool inside_polygon_int(int x, int y, int nr_coords, int x_coords[],
   //  return inside;
 
   bool inside, y_gt_y1, y_gt_y2, x_le_x1, x_le_x2;
-  long y1, y2, x1, x2, slope1, slope2; // int64 precision
+  // NOTE: long is only 32 bit on Windows -> use a fixed width type
+  int64_t y1, y2, x1, x2, slope1, slope2; // int64 precision
   int i, j;
 
   inside = false;
@@ -223,12 +223,14 @@ class AbstractTimezoneFinder(ABC):
         polys = self.get_shortcut_polys(lng=lng, lat=lat)
         if len(polys) == 0:
             return None
+        first_zone_id = self.zone_id_of(polys[0])
         if len(polys) == 1:
-            return self.zone_id_of(polys[0])
-        zones = self.zone_ids_of(polys)
-        zones_unique = np.unique(zones)
-        if len(zones_unique) == 1:
-            return zones_unique[0]
+            return first_zone_id
+        # Note: the polygons in the shortcuts are grouped by zone
+        # -> there is only one zone if the first and the last polygon belong to the same zone
+        # no need to read the zones of all polygons
+        if self.zone_id_of(polys[-1]) == first_zone_id:
+            return first_zone_id
         # more than one zone in this shortcut
         return None
 
@@ -281,6 +283,9 @@ class TimezoneFinderL(AbstractTimezoneFinder):
     the most common zone in a rectangle of a half degree of latitude and one degree of longitude
     """
 
+    # NOTE: no additional attributes -> empty __slots__ prevent the creation of an instance __dict__
+    __slots__ = ()
+
     def timezone_at(self, *, lng: float, lat: float) -> Optional[str]:
         """instantly returns the name of the most common zone within the corresponding shortcut
 
@@ -315,7 +320,7 @@ class TimezoneFinder(AbstractTimezoneFinder):
 
     # __slots__ declared in parents are available in child classes. However, child subclasses will get a __dict__
     # and __weakref__ unless they also define __slots__ (which should only contain names of any additional slots).
-    __slots__ = DATA_ATTRIBUTE_NAMES
+    __slots__ = DATA_ATTRIBUTE_NAMES + ["_nr_of_polygons"]
 
     binary_data_attributes = BINARY_DATA_ATTRIBUTES
 
@@ -339,6 +344,10 @@ class TimezoneFinder(AbstractTimezoneFinder):
         hole_registry = {int(k): v for k, v in hole_registry_tmp.items()}
         setattr(self, HOLE_REGISTRY, hole_registry)
 
+        # NOTE: the amount of polygons does not change -> determine the file size only once
+        poly_zone_ids = getattr(self, POLY_ZONE_IDS)
+        self._nr_of_polygons = utils.get_file_size_byte(poly_zone_ids) // NR_BYTES_H
+
     @property
     def nr_of_polygons(self) -> int:
         """
@@ -346,8 +355,7 @@ class TimezoneFinder(AbstractTimezoneFinder):
 
         :return: The number of polygons.
         """
-        poly_zone_ids = getattr(self, POLY_ZONE_IDS)
-        return utils.get_file_size_byte(poly_zone_ids) // NR_BYTES_H
+        return self._nr_of_polygons
 
     def coords_of(self, polygon_nr: int = 0) -> np.ndarray:
         """
@@ -384,16 +392,15 @@ class TimezoneFinder(AbstractTimezoneFinder):
         :param polygon_nr: Number of the polygon
         :yield: Generator of hole coordinates
         """
+        # NOTE: most polygons have no holes -> avoid raising (and catching) a KeyError in the common case
+        registry_entry = getattr(self, HOLE_REGISTRY).get(polygon_nr)
+        if registry_entry is None:
+            return
+
+        amount_of_holes, first_hole_id = registry_entry
         hole_coord_amount = getattr(self, HOLE_COORD_AMOUNT)
         hole_adr2data = getattr(self, HOLE_ADR2DATA)
         hole_data = getattr(self, HOLE_DATA)
-        hole_registry = getattr(self, HOLE_REGISTRY)
-
-        try:
-            amount_of_holes, first_hole_id = hole_registry[polygon_nr]
-        except KeyError:
-            return
-
         hole_coord_amount.seek(NR_BYTES_H * first_hole_id)
         hole_adr2data.seek(NR_BYTES_I * first_hole_id)
 
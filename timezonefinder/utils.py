@@ -22,6 +22,7 @@ from numpy import int64
 from timezonefinder.utils_clang import pt_in_poly_clang, clang_extension_loaded
 from timezonefinder.configs import (
     COORD2INT_FACTOR,
+    DTYPE_FORMAT_SIGNED_I_NUMPY,
     INT2COORD_FACTOR,
     OCEAN_TIMEZONE_PREFIX,
     CoordLists,
@@ -181,34 +182,24 @@ def coord2int(double: float) -> int:
     return int(double * COORD2INT_FACTOR)
 
 
-@njit(cache=True)
 def convert2coords(polygon_data: np.ndarray) -> CoordLists:
     # return a tuple of coordinate lists
-    return [
-        [int2coord(x) for x in polygon_data[0]],
-        [int2coord(y) for y in polygon_data[1]],
-    ]
+    # NOTE: convert all values at once instead of calling int2coord() for every single value
+    return (polygon_data * INT2COORD_FACTOR).tolist()
 
 
-@njit(cache=True)
 def convert2coord_pairs(polygon_data: np.ndarray) -> CoordPairs:
     # return a list of coordinate tuples (x,y)
-    x_coords = polygon_data[0]
-    y_coords = polygon_data[1]
-    nr_coords = len(x_coords)
-    coodinate_list = [
-        (int2coord(x_coords[i]), int2coord(y_coords[i])) for i in range(nr_coords)
-    ]
-    return coodinate_list
+    x_coords, y_coords = convert2coords(polygon_data)
+    return list(zip(x_coords, y_coords))
 
 
-@njit(cache=True)
 def convert2ints(polygon_data: np.ndarray) -> IntLists:
     # return a tuple of coordinate lists
-    return [
-        [coord2int(x) for x in polygon_data[0]],
-        [coord2int(y) for y in polygon_data[1]],
-    ]
+    # NOTE: convert all values at once instead of calling coord2int() for every single value
+    # truncating conversion identical to coord2int()
+    coords = np.asarray(polygon_data, dtype=np.float64)
+    return (coords * COORD2INT_FACTOR).astype(DTYPE_FORMAT_SIGNED_I_NUMPY).tolist()
 
 
 @njit(cache=True)